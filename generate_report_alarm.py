@@ -17,7 +17,7 @@ import sys
 import os
 import argparse
 import glob
-from pathlib import Path
+import io
 import warnings
 
 try:
@@ -36,7 +36,7 @@ except ImportError:
 
 # Importa utilità comuni
 from report_utils import (
-    convert_date_format, find_header_row, clean_dataframe_columns, 
+    convert_date_column, scan_csv_header, clean_dataframe_columns, 
     clean_dataframe_data, create_logo_header, get_common_styles, 
     add_page_number, create_missing_columns_note, get_common_table_style,
     setup_logging_for_pyinstaller, get_logo_path
@@ -62,9 +62,8 @@ def find_csv_alarm(directory="."):
     if not files:
         return None
     
-    # Seleziona il più recente per mtime, poi alfabeticamente
-    files.sort(key=lambda x: (os.path.getmtime(x), x), reverse=True)
-    return files[0]
+    # Seleziona il più recente per mtime, poi alfabeticamente (max: scansione lineare, senza ordinamento)
+    return max(files, key=lambda x: (os.path.getmtime(x), x))
 
 
 
@@ -74,26 +73,24 @@ def load_alarm_data(filepath, limit_rows=None):
     """Carica i dati ALARM dal CSV."""
     print(f"Caricamento dati da: {filepath}")
     
-    # Trova la riga header
-    header_row = find_header_row(filepath)
+    # Trova la riga header e il separatore con un'unica lettura dell'inizio del file
+    header_row, sep = scan_csv_header(filepath)
     print(f"Header trovato alla riga: {header_row + 1}")
     
     # Colonne richieste
     required_cols = ['Date', 'Time', 'Alarm Message', 'Alarm Status']
     
     try:
-        # Prova con engine pyarrow se disponibile
-        engine = 'pyarrow' if HAS_PYARROW else 'python'
-        
-        # Carica con separatore auto-detect
+        # Separatore già rilevato: engine C invece di 'python' con sep=None
         df = pd.read_csv(
             filepath,
             skiprows=header_row,
-            sep=None,  # Auto-detect separator
-            engine='python',  # Necessario per sep=None
+            sep=sep,
+            engine='c',
             quotechar='"',
             skipinitialspace=True,
-            nrows=limit_rows
+            nrows=limit_rows,
+            low_memory=False
         )
         
         print(f"Colonne trovate: {list(df.columns)}")
@@ -117,7 +114,7 @@ def load_alarm_data(filepath, limit_rows=None):
         
         # Converti formato date
         if 'Date' in df.columns:
-            df['Date'] = df['Date'].apply(convert_date_format)
+            df['Date'] = convert_date_column(df['Date'])
         
         print(f"Dati caricati: {len(df)} righe, {len(df.columns)} colonne")
         return df, missing_cols
@@ -131,9 +128,10 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
     """Genera il report PDF."""
     print(f"Generazione PDF: {output_path}")
     
-    # Setup documento
+    # Setup documento: PDF costruito in memoria e scritto su disco con un'unica write (utile su cartelle di rete)
+    pdf_buffer = io.BytesIO()
     doc = SimpleDocTemplate(
-        output_path,
+        pdf_buffer,
         pagesize=A4,
         leftMargin=2*cm,
         rightMargin=2*cm,
@@ -146,7 +144,7 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
     story = []
     
     # Header con logo e titolo
-    title = Path(source_filename).stem
+    title = os.path.splitext(os.path.basename(source_filename))[0]
     header = create_logo_header(logo_path, title, title_style)
     story.append(header)
     story.append(Spacer(1, 12))
@@ -166,15 +164,14 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
         headers = list(df.columns)
         table_data = [headers]  # Header senza Paragraph per mantenere il bold
         
-        for _, row in df.iterrows():
-            row_data = []
-            for col in headers:
-                cell_value = str(row[col]) if pd.notna(row[col]) else ""
-                # Usa Paragraph per celle lunghe (Alarm Message)
-                if col == 'Alarm Message' and len(cell_value) > 30:
-                    row_data.append(Paragraph(cell_value, cell_style))
-                else:
-                    row_data.append(cell_value)
+        # Valori estratti in un'unica conversione (NA -> ""), niente iterrows
+        values = df.astype(object).where(df.notna(), "").to_numpy()
+        message_idx = headers.index('Alarm Message') if 'Alarm Message' in headers else -1
+        for row in values:
+            row_data = [str(v) for v in row]
+            # Usa Paragraph per celle lunghe (Alarm Message)
+            if message_idx >= 0 and len(row_data[message_idx]) > 30:
+                row_data[message_idx] = Paragraph(row_data[message_idx], cell_style)
             table_data.append(row_data)
         
         # Calcola larghezze colonne
@@ -199,6 +196,8 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
     # Genera PDF
     try:
         doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
+        with open(output_path, 'wb') as f:
+            f.write(pdf_buffer.getvalue())
         print(f"PDF generato con successo: {output_path}")
         return True
     except Exception as e:
@@ -206,7 +205,7 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
         return False
 
 
-def main():
+def main(argv=None):
     # Setup logging per PyInstaller
     setup_logging_for_pyinstaller('alarm_report')
     
@@ -217,7 +216,7 @@ def main():
     parser.add_argument('--limit-rows', type=int, help='Limita numero righe per debug')
     parser.add_argument('--dry-run', action='store_true', help='Mostra info senza generare PDF')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Trova CSV se non specificato
     if args.csv:
@@ -254,7 +253,7 @@ def main():
     if args.out:
         output_path = args.out
     else:
-        base_name = Path(csv_path).stem
+        base_name = os.path.splitext(os.path.basename(csv_path))[0]
         output_path = f"{base_name}_report.pdf"
     
     # Logo path
@@ -17,7 +17,7 @@ import sys
 import os
 import argparse
 import glob
-from pathlib import Path
+import io
 import tempfile
 
 try:
@@ -26,6 +26,13 @@ except ImportError:
     print("ERROR: pandas non trovato. Installare con: pip install pandas", file=sys.stderr)
     sys.exit(1)
 
+# Copy-on-Write: la selezione delle colonne non duplica i dati (sempre attivo da pandas 3.0)
+if int(pd.__version__.split('.')[0]) < 3:
+    try:
+        pd.options.mode.copy_on_write = True
+    except Exception:
+        pass  # Opzione non disponibile nelle versioni di pandas più vecchie
+
 try:
     from reportlab.lib.pagesizes import A4, landscape
     from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak, Image
@@ -40,7 +47,6 @@ try:
     import matplotlib.pyplot as plt
     import matplotlib.dates as mdates
     from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-    import io
     HAS_MATPLOTLIB = True
 except ImportError:
     HAS_MATPLOTLIB = False
@@ -48,7 +54,7 @@ except ImportError:
 
 # Importa utilità comuni
 from report_utils import (
-    convert_date_format, find_header_row, clean_dataframe_columns, 
+    convert_date_column, scan_csv_header, clean_dataframe_columns, 
     clean_dataframe_data, create_logo_header, get_common_styles, 
     add_page_number, create_missing_columns_note, get_common_table_style,
     setup_logging_for_pyinstaller, get_logo_path
@@ -61,6 +67,10 @@ try:
 except ImportError:
     HAS_PYARROW = False
 
+# Schema BATCH standard (colonne QF escluse), nell'ordine di visualizzazione
+STANDARD_COLS = ['Date', 'Time', 'USER', 'TEMP_AIR_IN', 'TEMP_PRODUCT_1', 'TEMP_PRODUCT_2', 'TEMP_PRODUCT_3']
+TEMP_COLS = ['TEMP_AIR_IN', 'TEMP_PRODUCT_1', 'TEMP_PRODUCT_2', 'TEMP_PRODUCT_3']
+
 
 def find_csv_batch(directory="."):
     """Trova il file CSV BATCH più recente nella directory."""
@@ -74,9 +84,8 @@ def find_csv_batch(directory="."):
     if not files:
         return None
     
-    # Seleziona il più recente per mtime, poi alfabeticamente
-    files.sort(key=lambda x: (os.path.getmtime(x), x), reverse=True)
-    return files[0]
+    # Seleziona il più recente per mtime, poi alfabeticamente (max: scansione lineare, senza ordinamento)
+    return max(files, key=lambda x: (os.path.getmtime(x), x))
 
 
 
@@ -86,23 +95,24 @@ def load_batch_data(filepath, limit_rows=None):
     """Carica i dati BATCH dal CSV."""
     print(f"Caricamento dati da: {filepath}")
     
-    # Trova la riga header
-    header_row = find_header_row(filepath)
+    # Trova la riga header e il separatore con un'unica lettura dell'inizio del file
+    header_row, sep = scan_csv_header(filepath)
     print(f"Header trovato alla riga: {header_row + 1}")
     
     # Colonne richieste (ignorando QF)
-    required_cols = ['Date', 'Time', 'USER', 'TEMP_AIR_IN', 'TEMP_PRODUCT_1', 'TEMP_PRODUCT_2', 'TEMP_PRODUCT_3']
+    required_cols = STANDARD_COLS
     
     try:
-        # Carica con separatore auto-detect
+        # Separatore già rilevato: engine C invece di 'python' con sep=None
         df = pd.read_csv(
             filepath,
             skiprows=header_row,
-            sep=None,  # Auto-detect separator
-            engine='python',  # Necessario per sep=None
+            sep=sep,
+            engine='c',
             quotechar='"',
             skipinitialspace=True,
-            nrows=limit_rows
+            nrows=limit_rows,
+            low_memory=False
         )
         
         print(f"Colonne trovate: {list(df.columns)}")
@@ -121,23 +131,22 @@ def load_batch_data(filepath, limit_rows=None):
         
         # Seleziona solo le colonne richieste (quelle disponibili)
         available_cols = [col for col in required_cols if col in df.columns]
-        df = df[available_cols].copy()
+        df = df[available_cols]
         
         # Pulizia dati
         clean_dataframe_data(df)
         
-        # Conversione e arrotondamento temperature
-        temp_cols = ['TEMP_AIR_IN', 'TEMP_PRODUCT_1', 'TEMP_PRODUCT_2', 'TEMP_PRODUCT_3']
-        for col in temp_cols:
-            if col in df.columns:
-                try:
-                    # Sostituisci virgola con punto per separatore decimale
-                    df[col] = df[col].astype(str).str.replace(',', '.')
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                    # Arrotonda a 1 cifra decimale
-                    df[col] = df[col].round(1)
-                except Exception as e:
-                    print(f"WARNING: Errore conversione {col}: {e}", file=sys.stderr)
+        # Conversione e arrotondamento temperature in un unico passaggio sul blocco di colonne
+        temp_cols = [col for col in TEMP_COLS if col in df.columns]
+        if temp_cols:
+            try:
+                # Sostituisci virgola con punto per separatore decimale
+                values = pd.Series(df[temp_cols].to_numpy(dtype=str).ravel())
+                values = pd.to_numeric(values.str.replace(',', '.', regex=False), errors='coerce')
+                # Arrotonda a 1 cifra decimale
+                df[temp_cols] = values.round(1).to_numpy().reshape(len(df), len(temp_cols))
+            except Exception as e:
+                print(f"WARNING: Errore conversione temperature {temp_cols}: {e}", file=sys.stderr)
         
         # Crea datetime per sort e calcoli (prima della conversione formato)
         if 'Date' in df.columns and 'Time' in df.columns:
@@ -150,7 +159,7 @@ def load_batch_data(filepath, limit_rows=None):
         
         # Converti formato date DOPO aver creato DateTime
         if 'Date' in df.columns:
-            df['Date'] = df['Date'].apply(convert_date_format)
+            df['Date'] = convert_date_column(df['Date'])
         
         print(f"Dati caricati: {len(df)} righe, {len(df.columns)} colonne")
         return df, missing_cols
@@ -278,13 +287,64 @@ def create_temperature_chart(df, output_path=None):
         return None
 
 
+def format_header_text(col):
+    """Formatta il testo dell'header di una colonna per migliorare la leggibilità (in inglese)."""
+    # Inserisci spazi prima delle maiuscole per le colonne temperatura
+    if not col.startswith('TEMP_'):
+        return col
+    
+    parts = col.split('_')
+    # Formatta "TEMP_AIR_IN" come "Temp.<br/>Air<br/>Inlet"
+    if parts[1] == 'AIR' and len(parts) > 2 and parts[2] == 'IN':
+        return "Temp.<br/>Air<br/>Inlet"
+    # Formatta "TEMP_PRODUCT_1" come "Temp.<br/>Product<br/>1"
+    if parts[1] == 'PRODUCT' and len(parts) > 2:
+        return f"Temp.<br/>Product<br/>{parts[2]}"
+    # Fallback per altri formati
+    return "<br/>".join(parts)
+
+
+# Header e larghezze dello schema standard: dipendono solo dallo schema, costruiti una volta
+_HEADER_STYLE = get_common_styles()[3]
+_STANDARD_HEADERS = {col: Paragraph(format_header_text(col), _HEADER_STYLE) for col in STANDARD_COLS}
+_STANDARD_WIDTHS = (2*cm, 2*cm, 3.5*cm, 2*cm, 2*cm, 2*cm, 2*cm)
+
+
+def format_table_cell(cell_value, cell_style):
+    """Formatta una cella: Paragraph (word-wrap nativo) per i testi lunghi, stringa semplice altrimenti."""
+    if len(cell_value) <= 10:
+        return cell_value
+    
+    # Il word wrap sulla larghezza della colonna lo gestisce Paragraph
+    return Paragraph(cell_value, cell_style)
+
+
+def _format_standard_rows(arrays, n, cell_style):
+    """Formatta le righe dello schema standard (Date, Time, USER + 4 temperature) in un unico ciclo."""
+    dates, times, users, air_in, product_1, product_2, product_3 = arrays
+    rows = []
+    for i in range(n):
+        t0, t1, t2, t3 = air_in[i], product_1[i], product_2[i], product_3[i]
+        rows.append([
+            format_table_cell(dates[i], cell_style),
+            format_table_cell(times[i], cell_style),
+            format_table_cell(users[i], cell_style),
+            f'{t0:.1f}' if t0 == t0 else "",  # NaN != NaN
+            f'{t1:.1f}' if t1 == t1 else "",
+            f'{t2:.1f}' if t2 == t2 else "",
+            f'{t3:.1f}' if t3 == t3 else "",
+        ])
+    return rows
+
+
 def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_cols=None):
     """Genera il report PDF."""
     print(f"Generazione PDF: {output_path}")
     
-    # Setup documento principale (portrait)
+    # Setup documento principale (portrait), costruito in memoria e scritto con un'unica write
+    pdf_buffer = io.BytesIO()
     doc = SimpleDocTemplate(
-        output_path,
+        pdf_buffer,
         pagesize=A4,
         leftMargin=2*cm,
         rightMargin=2*cm,
@@ -307,7 +367,7 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
     story = []
     
     # Header con logo e titolo
-    title = Path(source_filename).stem
+    title = os.path.splitext(os.path.basename(source_filename))[0]
     header = create_logo_header(logo_path, title, title_style)
     story.append(header)
     
@@ -330,67 +390,31 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
         # Prepara dati tabella (esclude DateTime se presente)
         display_cols = [col for col in df.columns if col != 'DateTime']
         
-        # Formatta gli header per migliorare la leggibilità (in inglese)
-        formatted_headers = []
-        for col in display_cols:
-            # Inserisci spazi prima delle maiuscole per le colonne temperatura
-            if col.startswith('TEMP_'):
-                parts = col.split('_')
-                if len(parts) > 1:
-                    # Formatta "TEMP_AIR_IN" come "Temp.<br/>Air<br/>Inlet"
-                    if parts[1] == 'AIR' and len(parts) > 2 and parts[2] == 'IN':
-                        header_text = f"Temp.<br/>Air<br/>Inlet"
-                    # Formatta "TEMP_PRODUCT_1" come "Temp.<br/>Product<br/>1"
-                    elif parts[1] == 'PRODUCT' and len(parts) > 2:
-                        header_text = f"Temp.<br/>Product<br/>{parts[2]}"
-                    else:
-                        # Fallback per altri formati
-                        header_text = "<br/>".join(parts)
-                else:
-                    header_text = col
-                formatted_headers.append(Paragraph(header_text, header_style))
-            else:
-                formatted_headers.append(Paragraph(col, header_style))
+        # Header e larghezze: precalcolati per lo schema standard, dinamici altrimenti
+        if display_cols == STANDARD_COLS:
+            formatted_headers = list(_STANDARD_HEADERS.values())
+        else:
+            formatted_headers = [Paragraph(format_header_text(col), header_style) for col in display_cols]
         
         table_data = [formatted_headers]
         
-        for _, row in df.iterrows():
-            row_data = []
-            for col in display_cols:
-                cell_value = str(row[col]) if pd.notna(row[col]) else ""
-                # Usa Paragraph per tutte le celle per supportare word-wrap
-                if len(cell_value) > 10:
-                    # Cerca di dividere testi lunghi inserendo <br/> ogni ~15 caratteri
-                    if len(cell_value) > 30:
-                        # Trova spazi dove inserire break
-                        words = cell_value.split()
-                        lines = []
-                        current_line = ""
-                        
-                        for word in words:
-                            if len(current_line) + len(word) > 15:
-                                lines.append(current_line)
-                                current_line = word
-                            else:
-                                if current_line:
-                                    current_line += " " + word
-                                else:
-                                    current_line = word
-                        
-                        if current_line:
-                            lines.append(current_line)
-                        
-                        cell_value = "<br/>".join(lines)
-                    
-                    row_data.append(Paragraph(cell_value, cell_style))
-                else:
-                    row_data.append(cell_value)
-            table_data.append(row_data)
+        if display_cols == STANDARD_COLS and all(
+                pd.api.types.is_numeric_dtype(df[col]) for col in TEMP_COLS):
+            # Schema standard: formattazione specializzata senza dispatch per colonna
+            arrays = [df[col].astype(str).where(df[col].notna(), "").to_numpy() for col in ('Date', 'Time', 'USER')]
+            arrays += [df[col].to_numpy(dtype=float) for col in TEMP_COLS]
+            table_data.extend(_format_standard_rows(arrays, len(df), cell_style))
+        else:
+            # Valori estratti in un'unica conversione (NA -> ""), niente iterrows
+            values = df[display_cols].astype(object).where(df[display_cols].notna(), "").to_numpy()
+            table_data.extend(
+                [format_table_cell(str(v), cell_style) for v in row] for row in values
+            )
         
         # Calcola larghezze colonne (allargate)
         page_width = A4[0] - 3*cm  # Margini ridotti per più spazio
-        if len(display_cols) == 7:  # Date, Time, USER, 4 temperature
-            col_widths = [2*cm, 2*cm, 3.5*cm, 2*cm, 2*cm, 2*cm, 2*cm]
+        if display_cols == STANDARD_COLS:  # Date, Time, USER, 4 temperature
+            col_widths = _STANDARD_WIDTHS
         else:
             col_widths = [page_width/len(display_cols)] * len(display_cols)
         
@@ -412,6 +436,8 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
     # Genera PDF principale
     try:
         doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
+        with open(output_path, 'wb') as f:
+            f.write(pdf_buffer.getvalue())
         print(f"PDF principale generato con successo")
         
         # Aggiungi grafico delle temperature se disponibile
@@ -420,8 +446,9 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
             if chart_buffer:
                 # Crea documento landscape per il grafico
                 chart_output = output_path.replace('.pdf', '_temperature_trend.pdf')
+                chart_pdf_buffer = io.BytesIO()
                 chart_doc = SimpleDocTemplate(
-                    chart_output,
+                    chart_pdf_buffer,
                     pagesize=landscape(A4),
                     leftMargin=1.5*cm,
                     rightMargin=1.5*cm,
@@ -432,7 +459,7 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
                 chart_story = []
                 
                 # Header con logo e titolo per la pagina temperature trend
-                chart_title = f"{Path(source_filename).stem} - Temperature Trend"
+                chart_title = f"{os.path.splitext(os.path.basename(source_filename))[0]} - Temperature Trend"
                 chart_header = create_logo_header(logo_path, chart_title, title_style)
                 chart_story.append(chart_header)
                 chart_story.append(Spacer(1, 12))
@@ -443,6 +470,8 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
                 
                 # Genera PDF temperature trend (senza numerazione pagine)
                 chart_doc.build(chart_story)
+                with open(chart_output, 'wb') as f:
+                    f.write(chart_pdf_buffer.getvalue())
                 print(f"PDF temperature trend generato: {chart_output}")
         
         return True
@@ -451,7 +480,7 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
         return False
 
 
-def main():
+def main(argv=None):
     # Setup logging per PyInstaller
     setup_logging_for_pyinstaller('batch_report')
     
@@ -462,7 +491,7 @@ def main():
     parser.add_argument('--limit-rows', type=int, help='Limita numero righe per debug')
     parser.add_argument('--dry-run', action='store_true', help='Mostra info senza generare PDF')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Trova CSV se non specificato
     if args.csv:
@@ -503,7 +532,7 @@ def main():
     if args.out:
         output_path = args.out
     else:
-        base_name = Path(csv_path).stem
+        base_name = os.path.splitext(os.path.basename(csv_path))[0]
         output_path = f"{base_name}_report.pdf"
     
     # Genera PDF report
@@ -12,14 +12,17 @@ Version: 1.0.0
 Posizionamento: Script a livello delle cartelle DDMMYY contenenti i CSV OPERLOG.
 
 Uso:
-python generate_report_operlog.py [--csv <path_csv>] [--out <path_pdf>] [--logo <path_logo>] [--limit-rows N] [--dry-run]
+python generate_report_operlog.py [--csv <path_csv>] [--out <path_pdf>] [--logo <path_logo>] [--limit-rows N] [--dry-run] [--fast-render] [--no-cache]
+python generate_report_operlog.py --batch [--logo <path_logo>] [--limit-rows N] [--fast-render] [--no-cache]
 """
 
 import sys
 import os
 import argparse
-import glob
-import re
+import functools
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
 from datetime import datetime
 
 try:
@@ -30,15 +33,16 @@ except ImportError:
 
 try:
     from reportlab.lib.pagesizes import A4
-    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+    from reportlab.platypus import SimpleDocTemplate, LongTable, Paragraph, Spacer
     from reportlab.lib.units import cm
+    from reportlab.pdfbase.pdfmetrics import stringWidth
 except ImportError:
     print("ERROR: reportlab non trovato. Installare con: pip install reportlab", file=sys.stderr)
     sys.exit(1)
 
 # Importa utilità comuni
 from report_utils import (
-    convert_date_format, find_header_row, clean_dataframe_columns, 
+    convert_date_column, scan_csv_header, clean_dataframe_columns, 
     clean_dataframe_data, create_logo_header, get_common_styles, 
     add_page_number, create_missing_columns_note, get_common_table_style,
     setup_logging_for_pyinstaller, get_logo_path
@@ -51,90 +55,264 @@ try:
 except ImportError:
     HAS_PYARROW = False
 
+try:
+    import polars as pl
+    HAS_POLARS = True
+except ImportError:
+    HAS_POLARS = False
+
+# Colonne con testi potenzialmente lunghi, rese con Paragraph per il word-wrap
+LONG_TEXT_COLS = {'Object_Action', 'PreviousValue', 'ChangedValue', 'User', 'Trigger'}
+
+# Etichette header su più righe per le colonne con nomi lunghi
+_HEADER_LABELS = {
+    'PreviousValue': "Previous<br/>Value",
+    'ChangedValue': "Changed<br/>Value",
+    'Object_Action': "Object<br/>Action",
+}
+
+# Righe per tabella: le tabelle molto lunghe vengono spezzate in blocchi (numero pari per
+# mantenere l'alternanza dei colori tra un blocco e l'altro)
+TABLE_CHUNK_ROWS = 200
+
+# Rendering veloce (--fast-render): celle stringa troncate alla larghezza della colonna, senza Paragraph
+FAST_RENDER_FONT = 'Helvetica'
+FAST_RENDER_FONT_SIZE = 7
+FAST_RENDER_CELL_PADDING = 12  # Padding sinistro + destro di default delle celle ReportLab
+FAST_RENDER_ROW_HEIGHT = 0.5*cm
+
+# Dimensione oltre la quale il CSV viene letto con polars (se installato)
+POLARS_MIN_FILE_SIZE = 10 * 1024 * 1024
+
+# Versione del formato cache: incrementare quando cambia l'elaborazione dei dati
+CACHE_VERSION = 2
+
+# Modalità --batch: numero massimo di report generati in parallelo
+BATCH_MAX_WORKERS = 4
+
 
 def parse_directory_date(dirname):
     """Converte nome directory DDMMYY in oggetto datetime."""
-    match = re.match(r'^(\d{2})(\d{2})(\d{2})$', dirname)
-    if not match:
+    # Controllo diretto su 6 cifre ASCII, senza regex
+    if len(dirname) != 6 or not (dirname.isascii() and dirname.isdigit()):
         return None
     
-    day, month, year = match.groups()
+    day, month, year = int(dirname[0:2]), int(dirname[2:4]), int(dirname[4:6])
     
     # Assume secolo 20YY
-    full_year = 2000 + int(year)
+    full_year = 2000 + year
     
     try:
-        return datetime(full_year, int(month), int(day))
+        return datetime(full_year, month, day)
     except ValueError:
         # Data non valida
         return None
 
 
+def find_date_dirs(base_directory="."):
+    """Ritorna le sottocartelle DDMMYY come lista di tuple (data, path)."""
+    # scandir: tipo entry senza stat aggiuntive; prefiltro sul nome (6 cifre) prima di is_dir
+    date_dirs = []
+    with os.scandir(base_directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if len(name) != 6 or not name.isdigit():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                parsed_date = parse_directory_date(entry.name)
+                if parsed_date:
+                    date_dirs.append((parsed_date, entry.path))
+    return date_dirs
+
+
+def find_operlog_in_folder(folder):
+    """Trova il CSV OPERLOG più recente (per mtime) in una cartella, None se assente."""
+    # Un'unica scansione (match case-insensitive), mtime letto dalla stessa entry
+    candidates = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            name = entry.name.lower()
+            if 'operlog' in name and name.endswith('.csv') and entry.is_file():
+                candidates.append((entry.stat().st_mtime, entry.path))
+    
+    if not candidates:
+        return None
+    return max(candidates)[1]
+
+
 def find_csv_operlog(base_directory="."):
-    """Trova il file CSV OPERLOG più recente nella cartella DDMMYY più recente."""
+    """Trova il file CSV OPERLOG più recente nella cartella DDMMYY più recente che ne contiene uno."""
     print(f"Ricerca cartelle DDMMYY in: {base_directory}")
     
-    # Trova tutte le sottocartelle con pattern DDMMYY
-    date_dirs = []
-    for item in os.listdir(base_directory):
-        item_path = os.path.join(base_directory, item)
-        if os.path.isdir(item_path):
-            parsed_date = parse_directory_date(item)
-            if parsed_date:
-                date_dirs.append((parsed_date, item_path))
-    
+    date_dirs = find_date_dirs(base_directory)
     if not date_dirs:
         print("Nessuna cartella DDMMYY trovata", file=sys.stderr)
         return None
     
-    # Ordina per data (più recente prima)
-    date_dirs.sort(key=lambda x: x[0], reverse=True)
-    most_recent_dir = date_dirs[0][1]
-    
-    print(f"Cartella più recente: {most_recent_dir}")
+    # Cartelle dalla più recente: ci si ferma alla prima che contiene un CSV OPERLOG
+    date_dirs.sort(reverse=True)
+    print(f"Cartella più recente: {date_dirs[0][1]}")
     
-    # Cerca CSV OPERLOG nella cartella
-    pattern = os.path.join(most_recent_dir, "*operlog*.csv")
-    files = glob.glob(pattern, recursive=False)
+    for _, folder in date_dirs:
+        csv_path = find_operlog_in_folder(folder)
+        if csv_path:
+            if folder != date_dirs[0][1]:
+                print(f"Uso la cartella precedente più recente con CSV OPERLOG: {folder}")
+            return csv_path
+        print(f"Nessun file CSV OPERLOG trovato in: {folder}", file=sys.stderr)
     
-    # Cerca anche maiuscolo
-    pattern_upper = os.path.join(most_recent_dir, "*OPERLOG*.csv")
-    files.extend(glob.glob(pattern_upper, recursive=False))
+    return None
+
+
+def find_all_csv_operlog(base_directory="."):
+    """Trova il CSV OPERLOG più recente di ogni cartella DDMMYY (cartelle più recenti prima)."""
+    print(f"Ricerca cartelle DDMMYY in: {base_directory}")
     
-    if not files:
-        print(f"Nessun file CSV OPERLOG trovato in: {most_recent_dir}", file=sys.stderr)
+    csv_paths = []
+    for _, folder in sorted(find_date_dirs(base_directory), reverse=True):
+        csv_path = find_operlog_in_folder(folder)
+        if csv_path:
+            csv_paths.append(csv_path)
+    return csv_paths
+
+
+def get_cache_paths(filepath):
+    """Ritorna i path della cache feather e dei relativi metadati per un CSV."""
+    return f"{filepath}.feather", f"{filepath}.feather.json"
+
+
+def load_cached_data(filepath, limit_rows=None):
+    """Carica i dati dalla cache feather se valida (stesso mtime/size del CSV), altrimenti None."""
+    if not HAS_PYARROW:
         return None
     
-    # Seleziona il più recente per mtime
-    files.sort(key=os.path.getmtime, reverse=True)
-    return files[0]
-
+    cache_path, meta_path = get_cache_paths(filepath)
+    try:
+        stat = os.stat(filepath)
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        
+        if (meta.get('version') != CACHE_VERSION or meta.get('mtime') != stat.st_mtime
+                or meta.get('size') != stat.st_size or meta.get('limit_rows') != limit_rows):
+            return None
+        
+        return pd.read_feather(cache_path), meta.get('missing_cols', [])
+    except Exception:
+        # Cache assente o non leggibile: si rilegge il CSV
+        return None
 
 
+def save_cached_data(filepath, limit_rows, df, missing_cols):
+    """Salva i dati elaborati in cache feather accanto al CSV."""
+    if not HAS_PYARROW:
+        return
+    
+    cache_path, meta_path = get_cache_paths(filepath)
+    try:
+        stat = os.stat(filepath)
+        df.reset_index(drop=True).to_feather(cache_path)
+        meta = {
+            'version': CACHE_VERSION,
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'limit_rows': limit_rows,
+            'missing_cols': missing_cols,
+        }
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    except Exception as e:
+        print(f"WARNING: Impossibile salvare cache {cache_path}: {e}", file=sys.stderr)
 
 
-def load_operlog_data(filepath, limit_rows=None):
-    """Carica i dati OPERLOG dal CSV."""
+def load_operlog_data(filepath, limit_rows=None, use_cache=True):
+    """Carica i dati OPERLOG dal CSV (o dalla cache feather, se aggiornata)."""
     print(f"Caricamento dati da: {filepath}")
     
-    # Trova la riga header
-    header_row = find_header_row(filepath)
+    if use_cache:
+        cached = load_cached_data(filepath, limit_rows)
+        if cached is not None:
+            df, missing_cols = cached
+            print(f"Dati caricati da cache: {len(df)} righe, {len(df.columns)} colonne")
+            return df, missing_cols
+    
+    # Trova la riga header e il separatore con un'unica lettura dell'inizio del file
+    header_row, sep = scan_csv_header(filepath)
     print(f"Header trovato alla riga: {header_row + 1}")
     
     # Colonne richieste
     required_cols = ['Date', 'Time', 'User', 'Object_Action', 'Trigger', 'PreviousValue', 'ChangedValue']
     
     try:
-        # Carica con separatore auto-detect
-        df = pd.read_csv(
+        # Separatore già rilevato: niente engine 'python' (sep=None)
+        df = None
+        
+        # Lettura della sola riga header per selezionare già in lettura le colonne utili
+        # (richieste + Screen per il fallback su Object_Action); il confronto dei nomi
+        # replica la normalizzazione di clean_dataframe_columns
+        header_cols = pd.read_csv(
             filepath,
             skiprows=header_row,
-            sep=None,  # Auto-detect separator
-            engine='python',  # Necessario per sep=None
+            sep=sep,
+            engine='c',
             quotechar='"',
-            skipinitialspace=True,
-            nrows=limit_rows
-        )
+            nrows=0
+        ).columns
+        wanted = {col.lower() for col in required_cols + ['Screen']}
+        use_idx = [i for i, col in enumerate(header_cols)
+                   if str(col).strip().replace('"', '').replace("'", "").lower() in wanted]
+        usecols = [header_cols[i] for i in use_idx] if use_idx else None
+        if not use_idx:
+            use_idx = None
+        
+        # File grandi: lettore CSV multithread di polars, tutte le colonne come stringhe
+        if HAS_POLARS and os.path.getsize(filepath) > POLARS_MIN_FILE_SIZE:
+            try:
+                df = pl.read_csv(
+                    filepath,
+                    skip_rows=header_row,
+                    separator=sep,
+                    quote_char='"',
+                    infer_schema_length=0,
+                    columns=usecols,
+                    n_rows=limit_rows
+                ).to_pandas(use_pyarrow_extension_array=True)
+            except Exception as e:
+                print(f"WARNING: Lettura polars fallita, uso pandas: {e}", file=sys.stderr)
+                df = None
+        
+        # Con limit_rows si usa l'engine C, che si ferma dopo nrows righe; l'engine pyarrow
+        # non supporta nrows e leggerebbe comunque l'intero file
+        if df is None and HAS_PYARROW and limit_rows is None:
+            try:
+                # Parsing multithread con Arrow; l'engine pyarrow vuole l'indice della riga header
+                df = pd.read_csv(
+                    filepath,
+                    header=header_row,
+                    sep=sep,
+                    engine='pyarrow',
+                    quotechar='"',
+                    usecols=usecols,
+                    dtype='string',
+                    dtype_backend='pyarrow'
+                )
+            except Exception as e:
+                print(f"WARNING: Lettura pyarrow fallita, uso engine C: {e}", file=sys.stderr)
+                df = None
+        
+        if df is None:
+            df = pd.read_csv(
+                filepath,
+                skiprows=header_row,
+                sep=sep,
+                engine='c',
+                quotechar='"',
+                skipinitialspace=True,
+                usecols=use_idx,
+                dtype='string',
+                nrows=limit_rows,
+                low_memory=False,
+                dtype_backend='pyarrow' if HAS_PYARROW else 'numpy_nullable'
+            )
         
         print(f"Colonne trovate: {list(df.columns)}")
         
@@ -157,16 +335,20 @@ def load_operlog_data(filepath, limit_rows=None):
         
         # Seleziona solo le colonne richieste (quelle disponibili)
         available_cols = [col for col in required_cols if col in df.columns]
-        df = df[available_cols].copy()
+        df = df[available_cols]
         
         # Pulizia dati
         clean_dataframe_data(df)
         
-        # Converti formato date
+        # Converti formato date MM/DD/YYYY -> DD/MM/YY (vettorializzato, valori non validi invariati)
         if 'Date' in df.columns:
-            df['Date'] = df['Date'].apply(convert_date_format)
+            df['Date'] = convert_date_column(df['Date'])
         
         print(f"Dati caricati: {len(df)} righe, {len(df.columns)} colonne")
+        
+        if use_cache:
+            save_cached_data(filepath, limit_rows, df, missing_cols)
+        
         return df, missing_cols
         
     except Exception as e:
@@ -174,22 +356,67 @@ def load_operlog_data(filepath, limit_rows=None):
         return None, []
 
 
-def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_cols=None):
-    """Genera il report PDF."""
-    print(f"Generazione PDF: {output_path}")
+def build_table_style(data_font_size=8):
+    """Ritorna lo stile tabella OPERLOG: stile comune con font header/dati specifici."""
+    table_style = get_common_table_style()
+    table_style.add('FONTSIZE', (0, 0), (-1, 0), 9)  # Header font size
+    table_style.add('FONTSIZE', (0, 1), (-1, -1), data_font_size)  # Data font size
+    return table_style
+
+
+# Stili tabella riutilizzabili tra report e tra blocchi della stessa tabella
+_OPERLOG_TABLE_STYLE = build_table_style()
+_OPERLOG_FAST_TABLE_STYLE = build_table_style(data_font_size=FAST_RENDER_FONT_SIZE)
+
+
+def _fit_to_width(text, max_width):
+    """Tronca il testo con '…' in modo che, nel font del rendering veloce, stia in max_width punti."""
+    if stringWidth(text, FAST_RENDER_FONT, FAST_RENDER_FONT_SIZE) <= max_width:
+        return text
     
-    # Setup documento
+    # Ricerca binaria del prefisso più lungo che, con '…', sta nella colonna
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if stringWidth(text[:mid] + '…', FAST_RENDER_FONT, FAST_RENDER_FONT_SIZE) <= max_width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + '…'
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_styles():
+    """Stili comuni costruiti una sola volta per processo."""
+    return get_common_styles()
+
+
+def _build_pdf(output_path, story):
+    """Impagina la story nel PDF di output con margini e numeri di pagina del report."""
+    # PDF costruito in memoria e scritto su disco con un'unica write (utile su cartelle di rete)
+    pdf_buffer = io.BytesIO()
     doc = SimpleDocTemplate(
-        output_path,
+        pdf_buffer,
         pagesize=A4,
         leftMargin=2*cm,
         rightMargin=2*cm,
         topMargin=1.5*cm,
         bottomMargin=1.5*cm
     )
-    
-    # Stili comuni
-    styles, title_style, cell_style, header_style = get_common_styles()
+    try:
+        doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
+        with open(output_path, 'wb') as f:
+            f.write(pdf_buffer.getvalue())
+        print(f"PDF generato con successo: {output_path}")
+        return True
+    except Exception as e:
+        print(f"ERRORE durante generazione PDF: {e}", file=sys.stderr)
+        return False
+
+
+def _report_header(source_filename, logo_path, missing_cols):
+    """Elementi iniziali del report: logo, titolo e nota sulle colonne mancanti."""
+    styles, title_style, _, _ = _cached_styles()
     story = []
     
     # Header con logo e titolo
@@ -204,94 +431,168 @@ def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_
         story.append(missing_note)
         story.append(Spacer(1, 6))
     
-    # Tabella dati
-    if len(df) == 0:
-        no_data = Paragraph("Nessun dato disponibile", styles['Normal'])
-        story.append(no_data)
+    return story
+
+
+def _emit_empty_pdf(output_path, source_filename, logo_path=None, missing_cols=None):
+    """Genera il PDF minimo per un OPERLOG senza righe (nessuna preparazione della tabella)."""
+    story = _report_header(source_filename, logo_path, missing_cols)
+    story.append(Paragraph("Nessun dato disponibile", _cached_styles()[0]['Normal']))
+    return _build_pdf(output_path, story)
+
+
+def create_pdf_report(df, output_path, source_filename, logo_path=None, missing_cols=None, fast_render=False):
+    """Genera il report PDF (rendering veloce senza word-wrap se fast_render)."""
+    print(f"Generazione PDF: {output_path}")
+    
+    # OPERLOG vuoto: uscita anticipata senza costruire la tabella
+    if df is None or len(df) == 0:
+        return _emit_empty_pdf(output_path, source_filename, logo_path, missing_cols)
+    
+    # Stili comuni
+    _, _, cell_style, header_style = _cached_styles()
+    story = _report_header(source_filename, logo_path, missing_cols)
+    
+    # Tabella dati: header formattati per migliorare la leggibilità
+    formatted_headers = [Paragraph(_HEADER_LABELS.get(col, col), header_style) for col in df.columns]
+    
+    # Conversione in stringa e gestione NA vettorializzate in un unico passaggio
+    col_names = list(df.columns)
+    str_df = df.astype('string').fillna('')
+    arr = str_df.to_numpy()
+    
+    # Calcola larghezze colonne (gestisce variabili colonne)
+    page_width = A4[0] - 4*cm  # Margini - Aumentata larghezza disponibile
+    if len(df.columns) == 7:  # Tutte le colonne richieste
+        # Date e Time mantengono dimensione fissa, User allargato, altre colonne più larghe
+        col_widths = [1.6*cm, 1.6*cm, 2.2*cm, 3.2*cm, 1.8*cm, 2.8*cm, 2.8*cm]
     else:
-        # Formatta gli header per migliorare la leggibilità
-        formatted_headers = []
-        for col in df.columns:
-            if col == 'PreviousValue':
-                header_text = "Previous<br/>Value"
-                formatted_headers.append(Paragraph(header_text, header_style))
-            elif col == 'ChangedValue':
-                header_text = "Changed<br/>Value"
-                formatted_headers.append(Paragraph(header_text, header_style))
-            elif col == 'Object_Action':
-                header_text = "Object<br/>Action"
-                formatted_headers.append(Paragraph(header_text, header_style))
-            else:
-                formatted_headers.append(Paragraph(col, header_style))
-        
-        table_data = [formatted_headers]
+        col_widths = [page_width/len(df.columns)] * len(df.columns)
+    
+    table_rows = []
+    if fast_render:
+        # Solo stringhe, troncate alla larghezza utile della colonna (nessun testo fuori cella);
+        # troncamento calcolato una volta per valore distinto di ogni colonna
+        text_widths = [width - FAST_RENDER_CELL_PADDING for width in col_widths]
+        fitted = {}
         
-        for _, row in df.iterrows():
-            row_data = []
-            for col in df.columns:
-                cell_value = str(row[col]) if pd.notna(row[col]) else ""
-                # Usa Paragraph per celle lunghe con word wrapping migliorato
-                if col in ['Object_Action', 'PreviousValue', 'ChangedValue', 'User', 'Trigger'] and len(cell_value) > 15:
-                    # Migliora il word wrapping per testi lunghi
-                    if len(cell_value) > 40:
-                        # Inserisci spazi per facilitare il wrapping
-                        words = cell_value.split()
-                        wrapped_lines = []
-                        current_line = ""
-                        
-                        for word in words:
-                            if len(current_line) + len(word) > 25:
-                                if current_line:
-                                    wrapped_lines.append(current_line.strip())
-                                current_line = word
-                            else:
-                                if current_line:
-                                    current_line += " " + word
-                                else:
-                                    current_line = word
-                        
-                        if current_line:
-                            wrapped_lines.append(current_line.strip())
-                        
-                        cell_value = "<br/>".join(wrapped_lines)
-                    
-                    row_data.append(Paragraph(cell_value, cell_style))
-                else:
-                    row_data.append(cell_value)
-            table_data.append(row_data)
+        def fit_cell(j, cell_value):
+            key = (j, cell_value)
+            value = fitted.get(key)
+            if value is None:
+                value = fitted[key] = _fit_to_width(cell_value, text_widths[j])
+            return value
         
-        # Calcola larghezze colonne (gestisce variabili colonne)
-        page_width = A4[0] - 4*cm  # Margini - Aumentata larghezza disponibile
-        if len(df.columns) == 7:  # Tutte le colonne richieste
-            # Date e Time mantengono dimensione fissa, User allargato, altre colonne più larghe
-            col_widths = [1.6*cm, 1.6*cm, 2.2*cm, 3.2*cm, 1.8*cm, 2.8*cm, 2.8*cm]
+        table_rows = [[fit_cell(j, cell_value) for j, cell_value in enumerate(row)] for row in arr.tolist()]
+        truncated = sum(1 for (_, original), value in fitted.items() if value != original)
+        print(f"AVVISO: Rendering veloce, {truncated} valori distinti troncati alla larghezza della colonna",
+              file=sys.stderr)
+    else:
+        # Paragraph solo per le celle lunghe (> 15 caratteri) delle colonne testuali:
+        # il word wrap sulla larghezza colonna lo fa ReportLab. Le colonne senza celle
+        # lunghe (lunghezza massima vettorializzata) restano interamente stringhe semplici
+        wrap_col_idx = {j for j, col in enumerate(col_names)
+                        if col in LONG_TEXT_COLS and str_df[col].str.len().max() > 15}
+        if wrap_col_idx:
+            # Un solo Paragraph per valore distinto di ogni colonna (User, Trigger, ... si ripetono
+            # spesso): nella stessa colonna la larghezza è identica e l'oggetto può essere riusato
+            paragraphs = {}
+            
+            def cell_paragraph(j, cell_value):
+                key = (j, cell_value)
+                para = paragraphs.get(key)
+                if para is None:
+                    para = paragraphs[key] = Paragraph(cell_value, cell_style)
+                return para
+            
+            table_rows = [
+                [cell_paragraph(j, cell_value) if j in wrap_col_idx and len(cell_value) > 15 else cell_value
+                 for j, cell_value in enumerate(row)]
+                for row in arr.tolist()
+            ]
         else:
-            col_widths = [page_width/len(df.columns)] * len(df.columns)
-        
-        # Crea tabella
-        table = Table(table_data, colWidths=col_widths, repeatRows=1)
-        
-        # Applica stile comune e personalizzazioni specifiche
-        table_style = get_common_table_style()
-        table_style.add('FONTSIZE', (0, 0), (-1, 0), 9)  # Header font size
-        table_style.add('FONTSIZE', (0, 1), (-1, -1), 8)  # Data font size
+            table_rows = arr.tolist()
+    
+    # Stile comune e personalizzazioni specifiche (precalcolati, condivisi da tutti i blocchi)
+    table_style = _OPERLOG_FAST_TABLE_STYLE if fast_render else _OPERLOG_TABLE_STYLE
+    
+    # Crea tabelle a blocchi di righe: ReportLab impagina ogni blocco separatamente
+    for start in range(0, len(table_rows), TABLE_CHUNK_ROWS):
+        chunk_rows = table_rows[start:start + TABLE_CHUNK_ROWS]
+        table_data = [formatted_headers] + chunk_rows
+        # In rendering veloce l'altezza righe è fissa: ReportLab non deve misurare le celle
+        row_heights = [None] + [FAST_RENDER_ROW_HEIGHT] * len(chunk_rows) if fast_render else None
+        # LongTable: split tra pagine ottimizzato per tabelle lunghe
+        table = LongTable(table_data, colWidths=col_widths, rowHeights=row_heights, repeatRows=1)
         table.setStyle(table_style)
-        
         story.append(table)
+        if start + TABLE_CHUNK_ROWS < len(table_rows):
+            story.append(Spacer(1, 6))
     
     # Genera PDF
-    try:
-        doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
-        print(f"PDF generato con successo: {output_path}")
-        return True
-    except Exception as e:
-        print(f"ERRORE durante generazione PDF: {e}", file=sys.stderr)
+    return _build_pdf(output_path, story)
+
+
+def default_output_path(csv_path):
+    """Path del PDF di default: <nome_csv>_report.pdf accanto al CSV."""
+    # Usa os.path per gestire correttamente i separatori di percorso su Windows
+    base_name = os.path.splitext(os.path.basename(csv_path))[0]
+    csv_dir = os.path.dirname(csv_path)
+    return os.path.join(csv_dir, f"{base_name}_report.pdf")
+
+
+def generate_report(csv_path, output_path, logo_path=None, limit_rows=None, use_cache=True, fast_render=False):
+    """Pipeline completa per un CSV: caricamento dati e generazione PDF. Ritorna True se riuscita."""
+    df, missing_cols = load_operlog_data(csv_path, limit_rows, use_cache=use_cache)
+    if df is None:
+        print(f"ERRORE: Impossibile caricare i dati da: {csv_path}", file=sys.stderr)
         return False
+    return create_pdf_report(df, output_path, csv_path, logo_path, missing_cols, fast_render)
 
 
-def main():
+def run_batch(csv_paths, logo_path=None, limit_rows=None, use_cache=True, fast_render=False):
+    """Genera i report di più CSV in parallelo; ritorna il numero di report falliti."""
+    # Thread: il parsing CSV (engine C/pyarrow) rilascia il GIL e si sovrappone
+    # all'impaginazione ReportLab degli altri report
+    max_workers = min(BATCH_MAX_WORKERS, os.cpu_count() or 1, len(csv_paths))
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(generate_report, csv_path, default_output_path(csv_path),
+                            logo_path, limit_rows, use_cache, fast_render): csv_path
+            for csv_path in csv_paths
+        }
+        for future in as_completed(futures):
+            csv_path = futures[future]
+            try:
+                success = future.result()
+            except Exception as e:
+                print(f"ERRORE durante generazione report per {csv_path}: {e}", file=sys.stderr)
+                success = False
+            if success:
+                print(f"Report generato: {default_output_path(csv_path)}")
+            else:
+                failures += 1
+    return failures
+
+
+def configure_pandas():
+    """Abilita Copy-on-Write e stringhe PyArrow su pandas 2.x (entrambi default da pandas 3.0)."""
+    # Copy-on-Write: la selezione delle colonne non duplica i dati. Stringhe PyArrow: buffer
+    # UTF-8 contigui, più compatti degli array object. Impostate solo dallo script, non all'import
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.options.mode.copy_on_write = True
+        if HAS_PYARROW:
+            try:
+                pd.options.future.infer_string = True
+            except Exception:
+                pass  # Opzione disponibile da pandas 2.1
+
+
+def main(argv=None):
     # Setup logging per PyInstaller
     setup_logging_for_pyinstaller('operlog_report')
+    configure_pandas()
     
     parser = argparse.ArgumentParser(description='Genera report PDF da file CSV OPERLOG')
     parser.add_argument('--csv', help='Path del file CSV (auto-detect se omesso)')
@@ -299,8 +600,30 @@ def main():
     parser.add_argument('--logo', help='Path del logo (default: logo.png nella directory corrente)')
     parser.add_argument('--limit-rows', type=int, help='Limita numero righe per debug')
     parser.add_argument('--dry-run', action='store_true', help='Mostra info senza generare PDF')
+    parser.add_argument('--fast-render', action='store_true',
+                        help='Rendering veloce senza word-wrap (celle troncate alla larghezza della colonna)')
+    parser.add_argument('--no-cache', action='store_true', help='Non usare né aggiornare la cache feather del CSV')
+    parser.add_argument('--batch', action='store_true',
+                        help='Genera un report per il CSV OPERLOG più recente di ogni cartella DDMMYY')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.batch:
+        if args.csv or args.out or args.dry_run:
+            parser.error('--batch non è compatibile con --csv, --out e --dry-run')
+        
+        csv_paths = find_all_csv_operlog()
+        if not csv_paths:
+            print("ERRORE: Nessun file CSV OPERLOG trovato nelle cartelle DDMMYY", file=sys.stderr)
+            sys.exit(1)
+        
+        print(f"Modalità batch: {len(csv_paths)} file CSV OPERLOG")
+        failures = run_batch(csv_paths, get_logo_path(args.logo), args.limit_rows,
+                             use_cache=not args.no_cache, fast_render=args.fast_render)
+        if failures:
+            print(f"ERRORE: {failures} report non generati", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
     
     # Trova CSV se non specificato
     if args.csv:
@@ -317,7 +640,7 @@ def main():
     print(f"File CSV selezionato: {csv_path}")
     
     # Carica dati
-    df, missing_cols = load_operlog_data(csv_path, args.limit_rows)
+    df, missing_cols = load_operlog_data(csv_path, args.limit_rows, use_cache=not args.no_cache)
     if df is None:
         print("ERRORE: Impossibile caricare i dati", file=sys.stderr)
         sys.exit(1)
@@ -334,19 +657,13 @@ def main():
         return
     
     # Determina output path
-    if args.out:
-        output_path = args.out
-    else:
-        # Usa os.path per gestire correttamente i separatori di percorso su Windows
-        base_name = os.path.splitext(os.path.basename(csv_path))[0]
-        csv_dir = os.path.dirname(csv_path)
-        output_path = os.path.join(csv_dir, f"{base_name}_report.pdf")
+    output_path = args.out or default_output_path(csv_path)
     
     # Logo path
     logo_path = get_logo_path(args.logo)
     
     # Genera PDF
-    success = create_pdf_report(df, output_path, csv_path, logo_path, missing_cols)
+    success = create_pdf_report(df, output_path, csv_path, logo_path, missing_cols, args.fast_render)
     
     if success:
         print(f"Report generato: {output_path}")
@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=['printing'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -10,24 +10,22 @@ Version: 1.0.0
 
 import os
 import sys
-import glob
-import re
 import logging
-from pathlib import Path
-from time import sleep
 from datetime import datetime
 
+from printing import scan_pdfs, print_pdfs
+
 
 def setup_logging():
     """Configura il sistema di logging per file e console."""
     # Crea logger
     logger = logging.getLogger('pdf_printer')
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(logging.DEBUG if os.environ.get('PDF_PRINT_DEBUG') else logging.INFO)
     
-    # Handler per file
+    # Handler per file (INFO di default, DEBUG solo con PDF_PRINT_DEBUG impostata)
     log_file = f"pdf_print_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
+    file_handler.setLevel(logging.DEBUG if os.environ.get('PDF_PRINT_DEBUG') else logging.INFO)
     
     # Handler per console
     console_handler = logging.StreamHandler(sys.stdout)
@@ -47,17 +45,17 @@ def setup_logging():
 
 def parse_directory_date(dirname):
     """Converte nome directory DDMMYY in oggetto datetime."""
-    match = re.match(r'^(\d{2})(\d{2})(\d{2})$', dirname)
-    if not match:
+    # Controllo diretto su 6 cifre ASCII, senza regex
+    if len(dirname) != 6 or not (dirname.isascii() and dirname.isdigit()):
         return None
     
-    day, month, year = match.groups()
+    day, month, year = int(dirname[0:2]), int(dirname[2:4]), int(dirname[4:6])
     
     # Assume secolo 20YY
-    full_year = 2000 + int(year)
+    full_year = 2000 + year
     
     try:
-        return datetime(full_year, int(month), int(day))
+        return datetime(full_year, month, day)
     except ValueError:
         # Data non valida
         return None
@@ -66,37 +64,41 @@ def parse_directory_date(dirname):
 def find_latest_pdf_in_recent_folder(base_directory=".", logger=None):
     """Trova il PDF più recente nella cartella DDMMYY più recente."""
     if logger:
-        logger.info(f"Ricerca cartelle DDMMYY in: {os.path.abspath(base_directory)}")
+        logger.info("Ricerca cartelle DDMMYY in: %s", os.path.abspath(base_directory))
     
     # Verifica che la directory base esista
     if not os.path.exists(base_directory):
         if logger:
-            logger.error(f"Directory base non trovata: {base_directory}")
+            logger.error("Directory base non trovata: %s", base_directory)
         return None
     
     # Trova tutte le sottocartelle con pattern DDMMYY
     date_dirs = []
     try:
-        for item in os.listdir(base_directory):
-            item_path = os.path.join(base_directory, item)
-            if os.path.isdir(item_path):
-                if logger:
-                    logger.debug(f"Controllo directory: {item}")
-                parsed_date = parse_directory_date(item)
-                if parsed_date:
-                    date_dirs.append((parsed_date, item_path))
-                    if logger:
-                        logger.debug(f"Directory DDMMYY valida trovata: {item} -> {parsed_date}")
-                else:
+        with os.scandir(base_directory) as entries:
+            for entry in entries:
+                item = entry.name
+                # Prefiltro sul nome (6 cifre): scarta subito file e cartelle non DDMMYY
+                if len(item) != 6 or not item.isdigit():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
                     if logger:
-                        logger.debug(f"Directory non DDMMYY: {item}")
+                        logger.debug("Controllo directory: %s", item)
+                    parsed_date = parse_directory_date(item)
+                    if parsed_date:
+                        date_dirs.append((parsed_date, entry.path))
+                        if logger:
+                            logger.debug("Directory DDMMYY valida trovata: %s -> %s", item, parsed_date)
+                    else:
+                        if logger:
+                            logger.debug("Directory non DDMMYY: %s", item)
     except PermissionError as e:
         if logger:
-            logger.error(f"Errore di permessi nell'accesso a {base_directory}: {e}")
+            logger.error("Errore di permessi nell'accesso a %s: %s", base_directory, e)
         return None
     except Exception as e:
         if logger:
-            logger.error(f"Errore imprevisto nella ricerca directory: {e}")
+            logger.error("Errore imprevisto nella ricerca directory: %s", e)
         return None
     
     if not date_dirs:
@@ -104,103 +106,83 @@ def find_latest_pdf_in_recent_folder(base_directory=".", logger=None):
             logger.warning("Nessuna cartella DDMMYY trovata")
         return None
     
-    # Ordina per data (più recente prima)
-    date_dirs.sort(key=lambda x: x[0], reverse=True)
-    most_recent_dir = date_dirs[0][1]
+    # Seleziona la data più recente con una scansione lineare (nessun ordinamento completo)
+    most_recent_dir = max(date_dirs, key=lambda x: x[0])[1]
     
     if logger:
-        logger.info(f"Cartella più recente: {most_recent_dir}")
-        logger.info(f"Contenuto della cartella {most_recent_dir}:")
+        logger.info("Cartella più recente: %s", most_recent_dir)
+    
+    # Elenco del contenuto solo diagnostico: niente scansione e stat se il DEBUG non è attivo
+    if logger and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Contenuto della cartella %s:", most_recent_dir)
         try:
-            for item in os.listdir(most_recent_dir):
-                item_path = os.path.join(most_recent_dir, item)
-                if os.path.isfile(item_path):
-                    stat = os.stat(item_path)
-                    logger.info(f"  File: {item} - Dimensione: {stat.st_size} bytes - Modificato: {datetime.fromtimestamp(stat.st_mtime)}")
-                else:
-                    logger.info(f"  Directory: {item}")
+            # scandir: tipo e stat dalla DirEntry, senza isfile/stat separati per ogni voce
+            with os.scandir(most_recent_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        logger.debug("  File: %s - Dimensione: %d bytes - Modificato: %s", entry.name, stat.st_size, datetime.fromtimestamp(stat.st_mtime))
+                    else:
+                        logger.debug("  Directory: %s", entry.name)
         except Exception as e:
-            logger.error(f"Errore nel leggere contenuto directory: {e}")
+            logger.error("Errore nel leggere contenuto directory: %s", e)
     
-    # Cerca PDF nella cartella
+    # Cerca PDF nella cartella con un'unica scansione: mtime e dimensione da una sola stat per file
     try:
-        pdf_files = list(Path(most_recent_dir).glob("*.pdf"))
+        pdf_files = scan_pdfs(most_recent_dir)
         if logger:
-            logger.info(f"Trovati {len(pdf_files)} file PDF")
-            for pdf in pdf_files:
-                stat = pdf.stat()
-                logger.info(f"  PDF: {pdf.name} - Dimensione: {stat.st_size} bytes - Modificato: {datetime.fromtimestamp(stat.st_mtime)}")
+            logger.info("Trovati %d file PDF", len(pdf_files))
+        if logger and logger.isEnabledFor(logging.DEBUG):
+            for mtime, size, path in pdf_files:
+                logger.debug("  PDF: %s - Dimensione: %d bytes - Modificato: %s", os.path.basename(path), size, datetime.fromtimestamp(mtime))
     except Exception as e:
         if logger:
-            logger.error(f"Errore nella ricerca PDF: {e}")
+            logger.error("Errore nella ricerca PDF: %s", e)
         return None
     
     if not pdf_files:
         if logger:
-            logger.error(f"Nessun file PDF trovato in: {most_recent_dir}")
+            logger.error("Nessun file PDF trovato in: %s", most_recent_dir)
         return None
     
-    # Ordina per data di modifica (decrescente)
-    try:
-        pdf_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-        latest_pdf = pdf_files[0]
-        
-        if logger:
-            stat = latest_pdf.stat()
-            logger.info(f"PDF più recente selezionato: {latest_pdf}")
-            logger.info(f"  Dimensione: {stat.st_size} bytes")
-            logger.info(f"  Modificato: {datetime.fromtimestamp(stat.st_mtime)}")
-            logger.info(f"  Percorso completo: {os.path.abspath(latest_pdf)}")
-        
-        return latest_pdf
-    except Exception as e:
-        if logger:
-            logger.error(f"Errore nell'ordinamento PDF: {e}")
-        return None
+    # Seleziona il più recente per data di modifica (mtime già letto nella scansione)
+    mtime, size, latest_pdf = max(pdf_files)
+    
+    if logger:
+        logger.info("PDF più recente selezionato: %s", latest_pdf)
+        logger.info("  Dimensione: %d bytes", size)
+        logger.info("  Modificato: %s", datetime.fromtimestamp(mtime))
+        logger.info("  Percorso completo: %s", os.path.abspath(latest_pdf))
+    
+    return latest_pdf
 
 
 def print_pdf_windows(pdf_path, logger=None):
     """Stampa il PDF usando la stampante predefinita di Windows."""
     if logger:
-        logger.info(f"Tentativo di stampa: {pdf_path}")
+        logger.info("Tentativo di stampa: %s", pdf_path)
     
     # Verifica che il file esista
     if not os.path.exists(pdf_path):
         if logger:
-            logger.error(f"File PDF non trovato: {pdf_path}")
+            logger.error("File PDF non trovato: %s", pdf_path)
         return False
     
     # Verifica che sia un file PDF
     if not str(pdf_path).lower().endswith('.pdf'):
         if logger:
-            logger.error(f"File non è un PDF: {pdf_path}")
+            logger.error("File non è un PDF: %s", pdf_path)
         return False
     
-    try:
-        if logger:
-            logger.info(f"Invio alla stampante: {pdf_path}")
-        
-        # Usa os.startfile per Windows
-        os.startfile(str(pdf_path), "print")
-        
-        # Attendi qualche secondo per evitare che il processo termini troppo presto
-        sleep(3)
-        
-        if logger:
-            logger.info("Stampa inviata con successo alla coda di stampa")
-        return True
-        
-    except Exception as e:
-        if logger:
-            logger.error(f"ERRORE durante la stampa: {e}")
-        return False
+    # Invio alla stampante con attesa del lavoro nella coda di stampa (pausa fissa senza pywin32)
+    return print_pdfs([pdf_path], fallback_wait=3, logger=logger) == 1
 
 
 def main():
     # Setup logging
     logger = setup_logging()
     logger.info("=== AVVIO STAMPA PDF ===")
-    logger.info(f"Directory di lavoro: {os.getcwd()}")
+    logger.info("Directory di lavoro: %s", os.getcwd())
     
     try:
         # Cerca il PDF più recente nella cartella DDMMYY più recente
@@ -220,7 +202,7 @@ def main():
             sys.exit(2)
             
     except Exception as e:
-        logger.error(f"Errore imprevisto nel main: {e}")
+        logger.error("Errore imprevisto nel main: %s", e)
         sys.exit(3)
 
 
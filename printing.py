@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+printing.py
+
+Funzioni comuni per la ricerca e la stampa dei PDF, usate da print_latest_pdf.py
+e print_latest_pdf_from_recent_folder.py.
+
+Copyright © 2024 Filippo Caliò
+Version: 1.0.0
+"""
+
+import os
+import sys
+from time import sleep, monotonic
+
+# Su Windows con pywin32 si attende lo spooler di stampa invece di una pausa fissa
+try:
+    import win32print
+    HAS_PYWIN32 = True
+except ImportError:
+    HAS_PYWIN32 = False
+
+# Attesa massima del lavoro nella coda di stampa (s) e intervallo di polling (s)
+PRINT_WAIT_TIMEOUT = 10
+PRINT_POLL_INTERVAL = 0.1
+
+# Suffisso dei PDF con il grafico temperature generati dal report BATCH
+TREND_SUFFIX = '_temperature_trend.pdf'
+
+
+def scan_pdfs(folder="."):
+    """Ritorna i PDF di una cartella come tuple (mtime, dimensione, path) con un'unica scansione."""
+    pdf_files = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith('.pdf'):
+                stat = entry.stat()
+                pdf_files.append((stat.st_mtime, stat.st_size, entry.path))
+    return pdf_files
+
+
+def select_latest_pdfs(pdf_files, split_trend=True):
+    """Seleziona i PDF più recenti: principale e temperature trend se split_trend, altrimenti il solo più recente."""
+    if not pdf_files:
+        return []
+    
+    if not split_trend:
+        return [max(pdf_files)[2]]
+    
+    # Separa PDF principali e temperature trend
+    main_pdfs = [f for f in pdf_files if not f[2].endswith(TREND_SUFFIX)]
+    trend_pdfs = [f for f in pdf_files if f[2].endswith(TREND_SUFFIX)]
+    
+    # Prima il principale, poi il temperature trend
+    return [max(group)[2] for group in (main_pdfs, trend_pdfs) if group]
+
+
+def find_latest_pdfs(folder=".", split_trend=True):
+    """Trova i PDF più recenti di una cartella (vedi select_latest_pdfs)."""
+    return select_latest_pdfs(scan_pdfs(folder), split_trend)
+
+
+def _spooler_job_ids(hprinter, document):
+    """Id dei lavori in coda il cui nome documento contiene il nome del PDF."""
+    document = document.lower()
+    return {job['JobId'] for job in win32print.EnumJobs(hprinter, 0, 999, 1)
+            if document in (job.get('pDocument') or '').lower()}
+
+
+def _wait_for_print_job(hprinter, document, before, fallback_wait):
+    """Attende che il lavoro del PDF compaia e lasci la coda; False se è ancora in coda allo scadere."""
+    start = monotonic()
+    seen = False
+    while True:
+        elapsed = monotonic() - start
+        if elapsed >= PRINT_WAIT_TIMEOUT:
+            return False
+        # Lavoro mai comparso (già spoolato tra due controlli o su un'altra stampante):
+        # non si attende oltre la pausa fissa
+        if not seen and elapsed >= fallback_wait:
+            return True
+        sleep(PRINT_POLL_INTERVAL)
+        if _spooler_job_ids(hprinter, document) - before:
+            seen = True
+        elif seen:
+            return True
+
+
+def send_to_printer(pdf_path, fallback_wait=2):
+    """Invia il PDF alla stampante predefinita; False se il lavoro è ancora in coda allo scadere dell'attesa."""
+    document = os.path.basename(str(pdf_path))
+    hprinter = None
+    before = set()
+    if HAS_PYWIN32:
+        # Spooler non disponibile (nessuna stampante predefinita, errori di accesso): pausa fissa
+        try:
+            hprinter = win32print.OpenPrinter(win32print.GetDefaultPrinter())
+            before = _spooler_job_ids(hprinter, document)
+        except Exception:
+            if hprinter:
+                win32print.ClosePrinter(hprinter)
+            hprinter = None
+    
+    try:
+        os.startfile(str(pdf_path), "print")
+        if hprinter:
+            try:
+                return _wait_for_print_job(hprinter, document, before, fallback_wait)
+            except Exception:
+                pass  # Errore dello spooler durante l'attesa: ripiego sulla pausa fissa
+        # Senza spooler: attendi qualche secondo per evitare che il processo termini troppo presto
+        sleep(fallback_wait)
+        return True
+    finally:
+        if hprinter:
+            win32print.ClosePrinter(hprinter)
+
+
+def print_pdfs(pdf_paths, fallback_wait=2, logger=None):
+    """Stampa una lista di PDF in sequenza; ritorna il numero di PDF inviati con successo."""
+    # Formattazione differita con %, come logger.info, anche senza logger
+    info = logger.info if logger else (lambda msg, *args: print(msg % args))
+    
+    printed = 0
+    for pdf_path in pdf_paths:
+        try:
+            info("Invio alla stampante: %s", pdf_path)
+            if send_to_printer(pdf_path, fallback_wait):
+                info("Stampa inviata con successo alla coda di stampa")
+            elif logger:
+                logger.warning("Lavoro di stampa ancora in coda dopo %d secondi: %s", PRINT_WAIT_TIMEOUT, pdf_path)
+            else:
+                print(f"AVVISO: Lavoro di stampa ancora in coda dopo {PRINT_WAIT_TIMEOUT} secondi: {pdf_path}", file=sys.stderr)
+            printed += 1
+        except Exception as e:
+            if logger:
+                logger.error("ERRORE durante la stampa di %s: %s", pdf_path, e)
+            else:
+                print(f"ERRORE durante la stampa di {pdf_path}: {e}", file=sys.stderr)
+            # Continua con il prossimo PDF invece di terminare
+    return printed
@@ -11,7 +11,10 @@ Version: 1.0.0
 
 import sys
 import os
-from datetime import datetime
+import io
+import atexit
+import functools
+import csv
 
 try:
     import pandas as pd
@@ -31,48 +34,64 @@ except ImportError:
     sys.exit(1)
 
 
+# Dimensione del buffer del file di log negli eseguibili PyInstaller
+LOG_BUFFER_SIZE = 64 * 1024
+
+
+# Base delle risorse calcolata una volta all'import
+# (PyInstaller creates a temp folder and stores path in _MEIPASS)
+_RESOURCE_BASE = getattr(sys, '_MEIPASS', None) or os.path.abspath(".")
+
+
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller."""
+    return os.path.join(_RESOURCE_BASE, relative_path)
+
+
+def convert_date_column(dates):
+    """Converte una colonna di date da MM/DD/YYYY a DD/MM/YY (valori non validi invariati)."""
+    # Spazi ignorati come nella vecchia conversione riga per riga
+    parsed = pd.to_datetime(dates.astype(str).str.strip(), format='%m/%d/%Y', errors='coerce')
+    formatted = parsed.dt.strftime('%d/%m/%y')
+    # Valori originali allineati al dtype del risultato: nessun downcast implicito in where
+    return formatted.where(parsed.notna(), dates.astype(formatted.dtype))
+
+
+def _is_header_line(line):
+    """True se la riga (byte grezzi, senza decodifica) è l'header che inizia con 'Date'."""
+    # translate con delete rimuove entrambi i tipi di apice in un solo passaggio
+    return line.lstrip().translate(None, b'"\'')[:4].lower() == b'date'
+
+
+def _sniff_separator(sample, default=','):
+    """Rileva il separatore (tab, virgola, punto e virgola, pipe) da un campione di testo."""
     try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
+        return csv.Sniffer().sniff(sample, delimiters=',;\t|').delimiter
     except Exception:
-        base_path = os.path.abspath(".")
-    
-    return os.path.join(base_path, relative_path)
+        return default
 
 
-def convert_date_format(date_str):
-    """Converte formato data da MM/DD/YYYY a DD/MM/YY."""
+def scan_csv_header(filepath, max_scan_rows=10, default_sep=',', sample_size=8192):
+    """Trova riga header e separatore CSV con un'unica apertura e lettura del file."""
+    header_row = 3  # Default: riga 4 (0-indexed)
     try:
-        if pd.isna(date_str) or date_str == '' or str(date_str).strip() == '':
-            return date_str
-        
-        date_str = str(date_str).strip()
-        # Parse MM/DD/YYYY
-        dt = datetime.strptime(date_str, '%m/%d/%Y')
-        # Return DD/MM/YY
-        return dt.strftime('%d/%m/%y')
-    except:
-        # Se il parsing fallisce, ritorna il valore originale
-        return date_str
-
-
-def find_header_row(filepath, max_scan_rows=10):
-    """Trova la riga header che inizia con 'Date'."""
-    try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            for i, line in enumerate(f):
-                if i >= max_scan_rows:
-                    break
-                # Pulisci e controlla se inizia con Date
-                clean_line = line.strip().replace('"', '').replace("'", "")
-                if clean_line.lower().startswith('date'):
-                    return i
+        with open(filepath, 'rb') as f:
+            lines = [f.readline() for _ in range(max_scan_rows)]
+            rest = f.read(sample_size)
     except Exception as e:
         print(f"WARNING: Errore durante ricerca header: {e}", file=sys.stderr)
+        return header_row, default_sep
+    
+    for i, line in enumerate(lines):
+        if _is_header_line(line):
+            header_row = i
+            break
     
-    return 3  # Default: riga 4 (0-indexed)
+    # Campione per il separatore: dalla riga header in poi, senza l'ultima riga troncata
+    sample = (b''.join(lines[header_row:]) + rest)[:sample_size].decode('utf-8', 'ignore')
+    if len(sample) >= sample_size and '\n' in sample:
+        sample = sample[:sample.rindex('\n')]
+    return header_row, _sniff_separator(sample, default_sep)
 
 
 def clean_dataframe_columns(df, required_cols):
@@ -80,34 +99,54 @@ def clean_dataframe_columns(df, required_cols):
     # Pulizia nomi colonne
     df.columns = df.columns.str.strip().str.replace('"', '').str.replace("'", "")
     
-    # Controlla colonne richieste
+    # Controlla colonne richieste: lookup O(1) su set e dizionario dei nomi minuscoli
+    # (a parità di nome minuscolo vale la prima colonna, come nel match lineare)
+    cols_set = set(df.columns)
+    cols_lower = {}
+    for c in df.columns:
+        cols_lower.setdefault(c.lower(), c)
+    
     missing_cols = []
+    renames = {}
     for col in required_cols:
-        if col not in df.columns:
+        if col not in cols_set:
             # Prova match case-insensitive
-            matches = [c for c in df.columns if c.lower() == col.lower()]
-            if matches:
-                df.rename(columns={matches[0]: col}, inplace=True)
+            match = cols_lower.get(col.lower())
+            if match is not None:
+                renames[match] = col
             else:
                 missing_cols.append(col)
     
+    if renames:
+        df.rename(columns=renames, inplace=True)
+    
     return missing_cols
 
 
 def clean_dataframe_data(df):
     """Pulizia comune dei dati del dataframe."""
     for col in df.columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.strip().str.replace('"', '').str.replace("'", "")
-            # Sostituisci 'nan' string con stringa vuota
-            df[col] = df[col].replace('nan', '')
-            df[col] = df[col].replace("'-", '')  # Rimuovi segnaposto "'-"
+        # Colonne testuali: object, string e string[pyarrow]
+        if pd.api.types.is_string_dtype(df[col].dtype):
+            # Pulizia sui soli valori distinti (colonne a bassa cardinalità: stati, operatori, allarmi),
+            # poi ricostruzione della colonna dai codici: strip, segnaposto 'nan' e "'-" svuotati,
+            # rimozione apici e virgolette
+            codes, uniques = pd.factorize(df[col].to_numpy(dtype=object, na_value=''))
+            values = (str(v).strip() for v in uniques)
+            cleaned = ['' if v in ('nan', "'-") else v.replace('"', '').replace("'", "") for v in values]
+            df[col] = pd.Index(cleaned).take(codes)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_exists(path):
+    """os.path.exists memorizzato per processo (logo controllato una volta per report multipli)."""
+    return os.path.exists(path)
 
 
 def create_logo_header(logo_path, title, title_style):
     """Crea l'header con logo e titolo. Ritorna la tabella header o il titolo semplice."""
     logo_cell = ""
-    if logo_path and os.path.exists(logo_path):
+    if logo_path and _cached_exists(logo_path):
         try:
             logo = Image(logo_path, width=25*mm, height=25*mm, kind='proportional')
             logo_cell = logo
@@ -207,8 +246,11 @@ def setup_logging_for_pyinstaller(script_name):
     if getattr(sys, 'frozen', False):
         log_file = os.path.join(os.path.dirname(sys.executable), f'{script_name}.log')
         try:
-            sys.stdout = open(log_file, 'w', encoding='utf-8')
+            # Buffer da 64 KB senza flush a ogni riga: svuotato una sola volta all'uscita
+            buffer = io.BufferedWriter(open(log_file, 'wb', buffering=0), buffer_size=LOG_BUFFER_SIZE)
+            sys.stdout = io.TextIOWrapper(buffer, encoding='utf-8', line_buffering=False)
             sys.stderr = sys.stdout
+            atexit.register(sys.stdout.flush)
         except:
             pass  # If can't create log, continue without redirection
 
@@ -220,7 +262,7 @@ def get_logo_path(args_logo):
     else:
         # Try bundled logo first (for PyInstaller), then fallback to local
         bundled_logo = get_resource_path("logo.png")
-        if os.path.exists(bundled_logo):
+        if _cached_exists(bundled_logo):
             return bundled_logo
         else:
             return "logo.png" 
\ No newline at end of file
@@ -18,56 +18,56 @@ import os
 import sys
 import argparse
 import subprocess
-from pathlib import Path
-import glob
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 def find_csv_files(data_dir, report_type):
     """Trova i file CSV del tipo specificato nella directory."""
-    pattern_map = {
-        'batch': ['BATCH*.csv', 'batch*.csv'],
-        'alarm': ['ALARM*.csv', 'alarm*.csv'],
-        'operlog': ['OPERLOG*.csv', 'operlog*.csv'],
+    prefix_map = {
+        'batch': 'BATCH',
+        'alarm': 'ALARM',
+        'operlog': 'OPERLOG',
     }
     
-    if report_type not in pattern_map:
+    if report_type not in prefix_map:
         return []
+    prefix = prefix_map[report_type]
     
+    # Un'unica scansione con confronto case-insensitive (niente glob per pattern maiuscolo e minuscolo)
+    # e mtime letto dalla stessa entry
     files = []
-    for pattern in pattern_map[report_type]:
-        files.extend(glob.glob(os.path.join(data_dir, pattern)))
-    
-    # Filtra per evitare falsi positivi (ad esempio OPERLOG_BATCH per il tipo batch)
-    filtered_files = []
-    for file in files:
-        filename = os.path.basename(file).upper()
-        if report_type == 'batch':
-            # Esclude file che contengono OPERLOG o ALARM
-            if not ('OPERLOG' in filename or 'ALARM' in filename):
-                filtered_files.append(file)
-        elif report_type == 'alarm':
-            # Esclude file che contengono OPERLOG o file che iniziano con BATCH
-            if not ('OPERLOG' in filename or filename.startswith('BATCH')):
-                filtered_files.append(file)
-        elif report_type == 'operlog':
-            # Solo file che iniziano con OPERLOG
-            if filename.startswith('OPERLOG'):
-                filtered_files.append(file)
-        else:
-            filtered_files.append(file)
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            filename = entry.name.upper()
+            if not (filename.startswith(prefix) and filename.endswith('.CSV')):
+                continue
+            
+            # Filtra per evitare falsi positivi (ad esempio OPERLOG_BATCH per il tipo batch)
+            if report_type == 'batch':
+                # Esclude file che contengono OPERLOG o ALARM
+                if 'OPERLOG' in filename or 'ALARM' in filename:
+                    continue
+            elif report_type == 'alarm':
+                # Esclude file che contengono OPERLOG o file che iniziano con BATCH
+                if 'OPERLOG' in filename or filename.startswith('BATCH'):
+                    continue
+            
+            if entry.is_file():
+                files.append((entry.stat().st_mtime, entry.path))
     
     # Ordina per data di modifica (più recente prima)
-    filtered_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-    return filtered_files
+    files.sort(reverse=True)
+    return [path for _, path in files]
 
 
-def run_report_script(script_name, csv_file, output_dir, logo_path=None, limit_rows=None, dry_run=False):
-    """Esegue uno script di generazione report con i parametri specificati."""
-    cmd = [sys.executable, script_name, '--csv', csv_file]
+def run_report_script(script_name, csv_file, output_dir, logo_path=None, limit_rows=None, dry_run=False, label=None):
+    """Esegue uno script di generazione report; l'output viene mostrato in tempo reale (prefissato da label)."""
+    # -u: output del figlio non bufferizzato, così le righe arrivano man mano
+    cmd = [sys.executable, '-u', script_name, '--csv', csv_file]
     
     # Se è specificata una directory di output, crea il nome file di output
     if output_dir:
-        base_name = Path(csv_file).stem
+        base_name = os.path.splitext(os.path.basename(csv_file))[0]
         output_file = os.path.join(output_dir, f"{base_name}_report.pdf")
         cmd.extend(['--out', output_file])
     
@@ -84,19 +84,21 @@ def run_report_script(script_name, csv_file, output_dir, logo_path=None, limit_r
         cmd.append('--dry-run')
     
     print(f"Esecuzione: {' '.join(cmd)}")
+    prefix = f"[{label}] " if label else ""
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(result.stdout)
-        if result.stderr:
-            print(f"STDERR: {result.stderr}", file=sys.stderr)
-        return True
-    except subprocess.CalledProcessError as e:
+        # Output del figlio (stderr incluso) inoltrato riga per riga, senza accumularlo in memoria
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1) as proc:
+            for line in proc.stdout:
+                print(f"{prefix}{line}", end='')
+            returncode = proc.wait()
+    except OSError as e:
         print(f"ERRORE durante l'esecuzione di {script_name}: {e}", file=sys.stderr)
-        if e.stdout:
-            print(f"STDOUT: {e.stdout}")
-        if e.stderr:
-            print(f"STDERR: {e.stderr}", file=sys.stderr)
         return False
+    
+    if returncode != 0:
+        print(f"ERRORE durante l'esecuzione di {script_name}: codice di uscita {returncode}", file=sys.stderr)
+        return False
+    return True
 
 
 def main():
@@ -135,6 +137,9 @@ def main():
     if not os.path.exists(logo_path):
         print(f"AVVISO: Logo non trovato: {logo_path}", file=sys.stderr)
         logo_path = None
+    else:
+        # Path assoluto già verificato, passato così a tutti gli script figli
+        logo_path = os.path.abspath(logo_path)
     
     # Mappa script per tipo
     script_map = {
@@ -146,9 +151,8 @@ def main():
     # Determina quali tipi di report generare
     report_types = list(script_map.keys()) if args.type == 'all' else [args.type]
     
-    success_count = 0
-    failure_count = 0
-    
+    # Prepara un job (tipo, script, CSV più recente) per ogni tipo di report
+    jobs = []
     for report_type in report_types:
         script_name = script_map[report_type]
         
@@ -168,21 +172,33 @@ def main():
         csv_file = csv_files[0]
         print(f"\n=== Elaborazione {report_type.upper()} ===")
         print(f"File CSV: {csv_file}")
-        
-        # Esegui lo script
-        success = run_report_script(
-            script_name, 
-            csv_file, 
-            output_dir, 
-            logo_path, 
-            args.limit_rows, 
-            args.dry_run
-        )
-        
-        if success:
-            success_count += 1
-        else:
-            failure_count += 1
+        jobs.append((report_type, script_name, csv_file))
+    
+    success_count = 0
+    failure_count = 0
+    
+    # Gli script leggono CSV diversi e scrivono PDF diversi: eseguiti in parallelo
+    # (thread sufficienti, il lavoro è nei sottoprocessi)
+    if jobs:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {
+                executor.submit(
+                    run_report_script,
+                    script_name,
+                    csv_file,
+                    output_dir,
+                    logo_path,
+                    args.limit_rows,
+                    args.dry_run,
+                    report_type.upper()
+                ): report_type
+                for report_type, script_name, csv_file in jobs
+            }
+            for future in as_completed(futures):
+                if future.result():
+                    success_count += 1
+                else:
+                    failure_count += 1
     
     # Riepilogo
     print(f"\n=== RIEPILOGO ===")
@@ -0,0 +1,32 @@
+"""Test di report_utils."""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_utils import convert_date_column
+
+# Un downcast implicito in where (pandas 2.2 con future.infer_string) deve far fallire i test
+pytestmark = pytest.mark.filterwarnings('error::FutureWarning')
+
+
+@pytest.mark.parametrize('dtype', ['string', object, None])
+def test_convert_date_column_mixed_dates(dtype):
+    dates = pd.Series(['06/15/2025', ' 12/01/2024 ', 'n/a', '', '13/45/2025'], dtype=dtype)
+
+    result = convert_date_column(dates)
+
+    assert result.tolist() == ['15/06/25', '01/12/24', 'n/a', '', '13/45/2025']
+
+
+def test_convert_date_column_keeps_missing_values():
+    dates = pd.Series(['06/15/2025', None], dtype='string')
+
+    result = convert_date_column(dates)
+
+    assert result.iloc[0] == '15/06/25'
+    assert pd.isna(result.iloc[1])